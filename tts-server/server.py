@@ -15,18 +15,33 @@ The server will automatically download the Qwen3-TTS model on first run (~4GB).
 """
 
 import os
-import io
+import re
 import json
-import wave
+import itertools
+import struct
+import uuid
+import queue
 import hashlib
+import contextlib
 import logging
+import threading
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
 
-from flask import Flask, request, jsonify, send_file, Response
+import numpy as np
+from flask import Flask, request, jsonify, send_file, Response, stream_with_context
 from flask_cors import CORS
 
+try:
+    import torch
+    HAS_TORCH = True
+except ImportError:
+    torch = None
+    HAS_TORCH = False
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -44,13 +59,116 @@ class ServerConfig:
     port: int = 8765
     model_name: str = "Qwen/Qwen3-TTS-12Hz-0.6B-Base"  # Smaller model for faster inference
     cache_dir: str = "./cache"
+    memory_cache_mb: int = 256  # Upper bound for in-memory audio cache
+    max_batch_lines: int = 64  # Max lines per /synthesize_batch request
+    chunk_chars: int = 200  # Longer texts are synthesized sentence group by sentence group
+    warmup_text: str = "The stars are right."  # Synthesized once at startup to warm caches
     reference_audio: str = "./reference/gm-voice.wav"
     reference_text: str = "The shadows grow long as ancient evil stirs in the darkness."
     device: str = "auto"  # "cuda", "cpu", or "auto"
+    precision: str = "fp16"  # "fp16", "bf16", or "fp32" (fp16 falls back to bf16 on CPU)
+    compile_decoder: bool = False  # Opt-in: torch.compile the decoder on CUDA (CUDA graphs)
 
 
 config = ServerConfig()
 
+# ============================================================================
+# SCRATCH BUFFERS
+# ============================================================================
+
+class BufferPool:
+    """Pool of reusable numpy arrays, bucketed by power-of-two length."""
+
+    # Larger requests are allocated fresh instead of being pinned in the pool
+    MAX_POOLED_SIZE = 1 << 24
+
+    def __init__(self, dtype: str, max_per_size: int = 4):
+        self.dtype = dtype
+        self.max_per_size = max_per_size
+        self._pools = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, n: int):
+        """Return an array with at least n elements; slice it to [:n] before use."""
+        size = 1 << max(n - 1, 0).bit_length()
+        if size > self.MAX_POOLED_SIZE:
+            return np.empty(n, dtype=self.dtype)
+
+        with self._lock:
+            free = self._pools.get(size)
+            if free:
+                return free.pop()
+        return np.empty(size, dtype=self.dtype)
+
+    def release(self, buf) -> None:
+        """Give an array from acquire() back to the pool."""
+        size = buf.size
+        if size & (size - 1) or size > self.MAX_POOLED_SIZE:
+            return  # Non-standard size, let it be garbage collected
+
+        with self._lock:
+            free = self._pools.setdefault(size, [])
+            if len(free) < self.max_per_size:
+                free.append(buf)
+
+
+float32_pool = BufferPool("float32")
+
+# Process-wide pool of WAV scratch bytearrays. LIFO so the most recently used
+# (cache-warm, already grown) buffer is handed out first.
+_WAV_POOL = queue.LifoQueue(maxsize=64)
+
+
+def _borrow_wav_buffer(size: int) -> bytearray:
+    """Take a scratch bytearray of at least size bytes from the shared pool."""
+    try:
+        buf = _WAV_POOL.get_nowait()
+    except queue.Empty:
+        buf = None
+    if buf is None or len(buf) < size:
+        buf = bytearray(max(size, 1 << 20))
+    return buf
+
+
+def _return_wav_buffer(buf: bytearray) -> None:
+    """Give a scratch bytearray back to the shared pool."""
+    try:
+        _WAV_POOL.put_nowait(buf)
+    except queue.Full:
+        pass
+
+# Canonical 44-byte header for mono 16-bit PCM WAV
+_WAV_HEADER = struct.Struct("<4sI4s4sIHHIIHH4sI")
+
+# Data size advertised when streaming, before the real length is known
+_STREAM_DATA_SIZE = 0xFFFFFFFF - 36
+
+
+def _wav_header(data_size: int, sample_rate: int) -> bytes:
+    """Pack the RIFF/WAVE header for data_size bytes of mono 16-bit PCM."""
+    return _WAV_HEADER.pack(
+        b"RIFF", 36 + data_size, b"WAVE",
+        b"fmt ", 16, 1, 1, sample_rate, sample_rate * 2, 2, 16,
+        b"data", data_size
+    )
+
+_SENTENCE_END = re.compile(r"(?<=[.!?…])\s+")
+
+
+def _split_sentences(text: str, max_chars: int) -> List[str]:
+    """Split text at sentence boundaries, packing sentences into chunks of up to max_chars."""
+    chunks = []
+    current = ""
+    for sentence in _SENTENCE_END.split(text.strip()):
+        if current and len(current) + 1 + len(sentence) > max_chars:
+            chunks.append(current)
+            current = sentence
+        else:
+            current = f"{current} {sentence}" if current else sentence
+    if current:
+        chunks.append(current)
+    return chunks
+
 # ============================================================================
 # TTS ENGINE (Lazy loaded)
 # ============================================================================
@@ -58,72 +176,289 @@ config = ServerConfig()
 class TTSEngine:
     def __init__(self):
         self.model = None
+        self.device = "cpu"
+        self._eager_decoder = None  # Original decoder while a compiled one is installed
         self.voice_prompt = None
-        self.audio_cache = {}
+        self.audio_cache = OrderedDict()  # LRU: oldest entries first
+        self._cache_bytes = 0
+        self._cache_lock = threading.Lock()
+        self._disk_index = {}  # cache_key -> size of the WAV file in cache_dir (guarded by _cache_lock)
+        self._inflight = {}  # cache_key -> Future for syntheses in progress
+        self._inflight_lock = threading.Lock()
         self._initialized = False
+        self._warming_up = False
+        self._init_lock = threading.Lock()
+        self._voice_lock = threading.RLock()  # Guards voice_prompt and reference reloads
         self._download_progress = 0
+        # All model calls run on one dedicated thread; the GPU is a single resource
+        self._model_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tts-model")
+        # Disk cache writes happen off the request path, in submission order
+        self._io_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tts-cache-io")
 
     def initialize(self):
         """Initialize the TTS model. Called on first request."""
         if self._initialized:
             return
 
-        logger.info("Initializing Qwen3-TTS engine...")
-        logger.info(f"Loading model: {config.model_name}")
+        with self._init_lock:
+            # Another thread may have finished loading while we waited
+            if self._initialized:
+                return
+
+            logger.info("Initializing Qwen3-TTS engine...")
+            logger.info(f"Loading model: {config.model_name}")
+
+            try:
+                from qwen_tts import QwenTTS
+
+                # Determine device
+                device = config.device
+                if device == "auto":
+                    device = "cuda" if HAS_TORCH and torch.cuda.is_available() else "cpu"
+
+                logger.info(f"Using device: {device}")
+                self.device = device
 
+                # Load model (this downloads if not cached)
+                self.model = QwenTTS.from_pretrained(
+                    config.model_name,
+                    device=device
+                )
+                self._apply_precision()
+                self._compile_decoder()
+
+                # Create cache directory and index what is already on disk
+                Path(config.cache_dir).mkdir(parents=True, exist_ok=True)
+                self._load_disk_index()
+
+                # Load voice cloning prompt if reference audio exists
+                self._load_voice_prompt()
+
+                self._warm_model()
+
+                self._initialized = True
+                logger.info("TTS engine initialized successfully!")
+
+            except ImportError as e:
+                logger.error(f"Failed to import qwen_tts: {e}")
+                logger.error("Please install: pip install qwen-tts")
+                raise
+            except Exception as e:
+                logger.error(f"Failed to initialize TTS engine: {e}")
+                # Release the broken model; the next request retries from scratch
+                self.model = None
+                self._eager_decoder = None
+                raise
+
+    def start_warmup(self):
+        """Load the model on a background thread so the first request does not pay for it."""
+        def run():
+            try:
+                self.initialize()
+            except Exception:
+                pass  # Already logged; requests retry initialization lazily
+            finally:
+                self._warming_up = False
+
+        self._warming_up = True
+        threading.Thread(target=run, name="tts-warmup", daemon=True).start()
+
+    def _warm_model(self):
+        """Run one throwaway generation to trigger kernel selection, compilation and allocator setup."""
+        logger.info("Warming up model...")
         try:
-            from qwen_tts import QwenTTS
+            self._generate(config.warmup_text, 1.0)
+            return
+        except Exception as e:
+            if self._eager_decoder is None:
+                raise RuntimeError(f"Warm-up generation failed: {e}") from e
+            logger.warning(f"Compiled decoder failed during warm-up, reverting to eager: {e}")
 
-            # Determine device
-            device = config.device
-            if device == "auto":
-                import torch
-                device = "cuda" if torch.cuda.is_available() else "cpu"
+        # A model that cannot generate must not be reported as initialized
+        self._restore_eager_decoder()
+        try:
+            self._generate(config.warmup_text, 1.0)
+        except Exception as e:
+            raise RuntimeError(f"Warm-up generation failed: {e}") from e
 
-            logger.info(f"Using device: {device}")
+    def _apply_precision(self):
+        """Convert model weights to half precision where the device supports it."""
+        if config.precision == "fp32" or not HAS_TORCH:
+            return
 
-            # Load model (this downloads if not cached)
-            self.model = QwenTTS.from_pretrained(
-                config.model_name,
-                device=device
-            )
+        torch.set_float32_matmul_precision("high")
 
-            # Create cache directory
-            Path(config.cache_dir).mkdir(parents=True, exist_ok=True)
+        if self.device == "cuda" and config.precision == "fp16":
+            inner = getattr(self.model, "model", self.model)
+            if hasattr(inner, "half"):
+                inner.half()
+                logger.info("Model weights converted to fp16")
 
-            # Load voice cloning prompt if reference audio exists
-            self._load_voice_prompt()
+    def _compile_decoder(self):
+        """Compile the autoregressive decoder so per-token steps replay as CUDA graphs."""
+        if not config.compile_decoder or self.device != "cuda" or not HAS_TORCH:
+            return
 
-            self._initialized = True
-            logger.info("TTS engine initialized successfully!")
+        inner = getattr(self.model, "model", self.model)
+        decoder = getattr(inner, "decoder", None)
+        if decoder is None:
+            logger.warning("Model has no decoder attribute - skipping torch.compile")
+            return
 
-        except ImportError as e:
-            logger.error(f"Failed to import qwen_tts: {e}")
-            logger.error("Please install: pip install qwen-tts")
-            raise
+        # torch.compile is lazy: real compilation errors only surface on the
+        # first forward pass, so keep the eager decoder for _warm_model to restore
+        try:
+            inner.decoder = torch.compile(decoder, mode="reduce-overhead", fullgraph=False)
+            self._eager_decoder = decoder
+            logger.info("Decoder wrapped with torch.compile (reduce-overhead)")
         except Exception as e:
-            logger.error(f"Failed to initialize TTS engine: {e}")
-            raise
+            logger.warning(f"torch.compile failed, running decoder eagerly: {e}")
+
+    def _restore_eager_decoder(self):
+        """Swap the compiled decoder back for the original eager one."""
+        inner = getattr(self.model, "model", self.model)
+        inner.decoder = self._eager_decoder
+        self._eager_decoder = None
+
+    def _inference_context(self):
+        """Context for model calls: no autograd tracking, autocast to the configured precision."""
+        stack = contextlib.ExitStack()
+        if not HAS_TORCH:
+            return stack
+
+        stack.enter_context(torch.inference_mode())
+
+        if config.precision != "fp32" and self.device in ("cuda", "cpu"):
+            if self.device == "cuda" and config.precision == "fp16":
+                dtype = torch.float16
+            else:
+                dtype = torch.bfloat16
+            stack.enter_context(torch.autocast(device_type=self.device, dtype=dtype))
+
+        return stack
+
+    def _load_disk_index(self):
+        """Index cached WAV files, wiping them if the reference voice has changed."""
+        cache_dir = Path(config.cache_dir)
+        manifest_path = cache_dir / "index.json"
+        token = self._reference_token()
+
+        stored_token = None
+        if manifest_path.exists():
+            try:
+                with open(manifest_path, "r") as f:
+                    stored_token = json.load(f).get("reference_token")
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable cache manifest: {e}")
+
+        if stored_token != token:
+            if stored_token is not None:
+                logger.info("Reference voice changed - clearing audio cache")
+            self._clear_caches()
+            with open(manifest_path, "w") as f:
+                json.dump({"reference_token": token}, f)
+
+        index = {path.stem: path.stat().st_size for path in cache_dir.glob("*.wav")}
+        with self._cache_lock:
+            self._disk_index = index
+        logger.info(f"Indexed {len(index)} cached audio files")
+
+    def _reference_token(self) -> str:
+        """Fingerprint of the reference audio and transcript the cached audio was made with."""
+        digest = hashlib.sha256()
+        ref_path = Path(config.reference_audio)
+        if ref_path.exists():
+            digest.update(ref_path.read_bytes())
+        digest.update(b"\0")
+        digest.update(config.reference_text.encode())
+        return digest.hexdigest()
+
+    def _clear_caches(self):
+        """Drop all cached audio from memory and disk."""
+        with self._cache_lock:
+            self.audio_cache.clear()
+            self._cache_bytes = 0
+
+        # Run on the I/O thread so writes queued before the wipe are removed too
+        self._io_executor.submit(self._wipe_disk_cache).result()
+
+    def _wipe_disk_cache(self):
+        """Delete cached WAV files; only called on the I/O thread."""
+        with self._cache_lock:
+            self._disk_index = {}
+        for path in Path(config.cache_dir).glob("*.wav"):
+            path.unlink(missing_ok=True)
+
+    def reload_reference(self):
+        """Pick up a new reference voice, invalidating audio made with the old one."""
+        # Wait out an initialize() in progress; it may already be past loading
+        # the prompt, so the new reference has to be applied afterwards
+        with self._init_lock:
+            if not self._initialized:
+                return  # initialize() will load the prompt and check the cache then
+
+        with self._voice_lock:
+            self._load_disk_index()
+            self._load_voice_prompt()
 
     def _load_voice_prompt(self):
         """Load or create voice cloning prompt from reference audio."""
         ref_path = Path(config.reference_audio)
 
-        if not ref_path.exists():
-            logger.warning(f"Reference audio not found: {ref_path}")
-            logger.warning("Voice cloning disabled. Using default voice.")
-            return
-
-        try:
-            logger.info(f"Creating voice prompt from: {ref_path}")
-            self.voice_prompt = self.model.create_voice_clone_prompt(
-                ref_audio=str(ref_path),
-                ref_text=config.reference_text
+        with self._voice_lock:
+            if not ref_path.exists():
+                logger.warning(f"Reference audio not found: {ref_path}")
+                logger.warning("Voice cloning disabled. Using default voice.")
+                self.voice_prompt = None
+                return
+
+            # Reuse the prompt saved for this exact reference audio, text, model,
+            # device and precision (the saved tensors keep the dtype they were made in)
+            prompt_key = hashlib.blake2b(
+                f"{self._reference_token()}|{config.model_name}|{self.device}|{config.precision}".encode(),
+                digest_size=8
+            ).hexdigest()
+            prompt_path = Path(config.cache_dir) / f"voice_prompt_{prompt_key}.pt"
+            if HAS_TORCH and prompt_path.exists():
+                try:
+                    self.voice_prompt = torch.load(
+                        prompt_path, map_location=self.device, weights_only=False
+                    )
+                    logger.info(f"Loaded cached voice prompt: {prompt_path}")
+                    return
+                except Exception as e:
+                    logger.warning(f"Ignoring unreadable voice prompt cache: {e}")
+
+            try:
+                logger.info(f"Creating voice prompt from: {ref_path}")
+                self.voice_prompt = self._model_executor.submit(
+                    self._run_create_prompt, str(ref_path), config.reference_text
+                ).result()
+                logger.info("Voice cloning prompt created successfully!")
+            except Exception as e:
+                logger.error(f"Failed to create voice prompt: {e}")
+                self.voice_prompt = None
+                return
+
+            if not HAS_TORCH:
+                return
+
+            try:
+                torch.save(self.voice_prompt, prompt_path)
+                # Prompts for earlier reference audio will not be needed again
+                for old_path in Path(config.cache_dir).glob("voice_prompt_*.pt"):
+                    if old_path != prompt_path:
+                        old_path.unlink(missing_ok=True)
+            except Exception as e:
+                logger.warning(f"Failed to cache voice prompt: {e}")
+
+    def _run_create_prompt(self, ref_audio: str, ref_text: str):
+        """Voice prompt creation proper; only ever executed on the model worker thread."""
+        with self._inference_context():
+            return self.model.create_voice_clone_prompt(
+                ref_audio=ref_audio,
+                ref_text=ref_text
             )
-            logger.info("Voice cloning prompt created successfully!")
-        except Exception as e:
-            logger.error(f"Failed to create voice prompt: {e}")
-            self.voice_prompt = None
 
     def synthesize(self, text: str, rate: float = 1.0) -> bytes:
         """Synthesize speech from text."""
@@ -132,78 +467,270 @@ class TTSEngine:
 
         # Check cache
         cache_key = self._get_cache_key(text, rate)
-        if cache_key in self.audio_cache:
+        audio_data = self._cache_get(cache_key)
+        if audio_data is not None:
             logger.debug(f"Cache hit for: {text[:50]}...")
-            return self.audio_cache[cache_key]
+            return audio_data
 
         # Check file cache
         cache_path = Path(config.cache_dir) / f"{cache_key}.wav"
-        if cache_path.exists():
-            logger.debug(f"File cache hit for: {text[:50]}...")
-            with open(cache_path, "rb") as f:
-                audio_data = f.read()
-            self.audio_cache[cache_key] = audio_data
-            return audio_data
+        with self._cache_lock:
+            on_disk = cache_key in self._disk_index
+        if on_disk:
+            try:
+                with open(cache_path, "rb") as f:
+                    audio_data = f.read()
+                logger.debug(f"File cache hit for: {text[:50]}...")
+                self._cache_put(cache_key, audio_data)
+                return audio_data
+            except FileNotFoundError:
+                with self._cache_lock:
+                    self._disk_index.pop(cache_key, None)
+
+        # Join an identical synthesis that is already running instead of repeating it
+        with self._inflight_lock:
+            future = self._inflight.get(cache_key)
+            is_owner = future is None
+            if is_owner:
+                # A previous owner may have cached the result since our first check
+                audio_data = self._cache_get(cache_key)
+                if audio_data is not None:
+                    return audio_data
+                future = Future()
+                self._inflight[cache_key] = future
+
+        if not is_owner:
+            logger.debug(f"Waiting on in-flight synthesis for: {text[:50]}...")
+            return future.result()
 
         # Generate speech
         logger.info(f"Synthesizing: {text[:50]}...")
 
         try:
-            if self.voice_prompt is not None:
-                # Use voice cloning
-                audio_array, sample_rate = self.model.generate_voice_clone(
-                    text=text,
-                    voice_prompt=self.voice_prompt,
-                    speed=rate
-                )
-            else:
-                # Use default voice
-                audio_array, sample_rate = self.model.generate(
-                    text=text,
-                    speed=rate
-                )
+            # Hold the voice lock until the result is cached so a concurrent
+            # /reference upload cannot leave audio from the old voice behind
+            with self._voice_lock:
+                audio_array, sample_rate = self._generate(text, rate)
 
-            # Convert to WAV bytes
-            audio_data = self._array_to_wav(audio_array, sample_rate)
+                # Convert to WAV bytes
+                audio_data = self._array_to_wav(audio_array, sample_rate)
 
-            # Cache result
-            self.audio_cache[cache_key] = audio_data
-            with open(cache_path, "wb") as f:
-                f.write(audio_data)
+                # Cache result
+                self._store(cache_key, audio_data)
 
+            future.set_result(audio_data)
             return audio_data
 
         except Exception as e:
             logger.error(f"Synthesis failed: {e}")
+            future.set_exception(e)
             raise
 
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(cache_key, None)
+
+    def synthesize_stream(self, text: str, rate: float = 1.0):
+        """Yield WAV bytes for text piece by piece as its sentence chunks are generated."""
+        if not self._initialized:
+            self.initialize()
+
+        cache_key = self._get_cache_key(text, rate)
+        audio_data = self._cache_get(cache_key)
+        if audio_data is not None:
+            yield audio_data
+            return
+
+        with self._voice_lock:
+            voice_prompt = self.voice_prompt
+
+        logger.info(f"Streaming: {text[:50]}...")
+        futures = [
+            self._model_executor.submit(self._run_model, chunk, rate, voice_prompt)
+            for chunk in _split_sentences(text, config.chunk_chars) or [text]
+        ]
+
+        pcm_parts = []
+        sample_rate = None
+        try:
+            for future in futures:
+                audio_array, chunk_rate = future.result()
+                if sample_rate is None:
+                    sample_rate = chunk_rate
+                    yield _wav_header(_STREAM_DATA_SIZE, sample_rate)
+                elif chunk_rate != sample_rate:
+                    raise RuntimeError("Model returned mixed sample rates for one text")
+
+                pcm = self._array_to_pcm(audio_array)
+                pcm_parts.append(pcm)
+                yield pcm
+        finally:
+            # Stop queued chunks if the client went away or generation failed
+            for future in futures:
+                future.cancel()
+
+        # Keep the complete WAV so the next request for this text is a cache hit,
+        # unless the reference voice changed while we were streaming
+        pcm = b"".join(pcm_parts)
+        audio_data = _wav_header(len(pcm), sample_rate) + pcm
+        with self._voice_lock:
+            if self.voice_prompt is voice_prompt:
+                self._store(cache_key, audio_data)
+
+    def _store(self, cache_key: str, audio_data: bytes):
+        """Save generated audio to the memory cache now and to the disk cache in the background."""
+        self._cache_put(cache_key, audio_data)
+        self._io_executor.submit(self._write_cache_file, cache_key, audio_data)
+
+    def _write_cache_file(self, cache_key: str, audio_data: bytes):
+        """Write one WAV to the disk cache; only called on the I/O thread."""
+        cache_path = Path(config.cache_dir) / f"{cache_key}.wav"
+        tmp_path = cache_path.with_suffix(".tmp")
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(audio_data)
+            # Atomic rename so send_file never serves a half-written file
+            os.replace(tmp_path, cache_path)
+            with self._cache_lock:
+                self._disk_index[cache_key] = len(audio_data)
+        except OSError as e:
+            logger.error(f"Failed to write cache file {cache_path}: {e}")
+            tmp_path.unlink(missing_ok=True)
+
+    def shutdown(self):
+        """Wait for pending disk cache writes and stop the worker threads."""
+        self._io_executor.shutdown(wait=True)
+        self._model_executor.shutdown(wait=False, cancel_futures=True)
+
+    def _generate(self, text: str, rate: float):
+        """Run the model on text, returning (audio_array, sample_rate)."""
+        with self._voice_lock:
+            voice_prompt = self.voice_prompt
+
+        if len(text) <= config.chunk_chars:
+            return self._model_executor.submit(self._run_model, text, rate, voice_prompt).result()
+
+        # Queue every sentence group up front so the model never idles between
+        # them, then stitch the PCM in memory
+        futures = [
+            self._model_executor.submit(self._run_model, chunk, rate, voice_prompt)
+            for chunk in _split_sentences(text, config.chunk_chars) or [text]
+        ]
+        results = [future.result() for future in futures]
+
+        sample_rate = results[0][1]
+        if any(sr != sample_rate for _, sr in results):
+            raise RuntimeError("Model returned mixed sample rates for one text")
+        return np.concatenate([np.ravel(audio) for audio, _ in results]), sample_rate
+
+    def _run_model(self, text: str, rate: float, voice_prompt):
+        """Model call proper; only ever executed on the model worker thread."""
+        with self._inference_context():
+            if voice_prompt is not None:
+                # Use voice cloning
+                return self.model.generate_voice_clone(
+                    text=text,
+                    voice_prompt=voice_prompt,
+                    speed=rate
+                )
+
+            # Use default voice
+            return self.model.generate(
+                text=text,
+                speed=rate
+            )
+
+    def get_cached_file(self, text: str, rate: float = 1.0) -> Optional[Path]:
+        """Return the on-disk WAV for text + settings if it has already been generated."""
+        cache_key = self._get_cache_key(text, rate)
+        with self._cache_lock:
+            if cache_key not in self._disk_index:
+                return None
+        return Path(config.cache_dir) / f"{cache_key}.wav"
+
+    def synthesize_batch(self, lines: List[str], rate: float = 1.0) -> List[bytes]:
+        """Synthesize several lines in one call, generating repeated lines only once."""
+        results = {}
+        for line in lines:
+            if line not in results:
+                results[line] = self.synthesize(line, rate)
+        return [results[line] for line in lines]
+
+    def _cache_get(self, key: str) -> Optional[bytes]:
+        """Look up audio in the memory cache, marking it most recently used."""
+        with self._cache_lock:
+            audio_data = self.audio_cache.get(key)
+            if audio_data is not None:
+                self.audio_cache.move_to_end(key)
+            return audio_data
+
+    def _cache_put(self, key: str, audio_data: bytes):
+        """Store audio in the memory cache, evicting the oldest entries over the limit."""
+        max_bytes = config.memory_cache_mb * 1024 * 1024
+        with self._cache_lock:
+            old = self.audio_cache.pop(key, None)
+            if old is not None:
+                self._cache_bytes -= len(old)
+            self.audio_cache[key] = audio_data
+            self._cache_bytes += len(audio_data)
+            while self._cache_bytes > max_bytes and self.audio_cache:
+                _, evicted = self.audio_cache.popitem(last=False)
+                self._cache_bytes -= len(evicted)
+
     def _get_cache_key(self, text: str, rate: float) -> str:
         """Generate cache key for text + settings."""
         content = f"{text}|{rate}|{config.model_name}"
-        return hashlib.md5(content.encode()).hexdigest()
+        # 128-bit BLAKE2b keeps the 32-char file names and hashes faster than MD5
+        return hashlib.blake2b(content.encode(), digest_size=16).hexdigest()
 
     def _array_to_wav(self, audio_array, sample_rate: int) -> bytes:
         """Convert numpy array to WAV bytes."""
-        import numpy as np
-
-        # Normalize to int16
-        audio_int16 = (audio_array * 32767).astype(np.int16)
-
-        # Create WAV in memory
-        buffer = io.BytesIO()
-        with wave.open(buffer, "wb") as wav:
-            wav.setnchannels(1)
-            wav.setsampwidth(2)  # 16-bit
-            wav.setframerate(sample_rate)
-            wav.writeframes(audio_int16.tobytes())
-
-        buffer.seek(0)
-        return buffer.read()
+        audio_array = np.ravel(audio_array)
+        n = audio_array.size
+        data_size = n * 2
+        total = _WAV_HEADER.size + data_size
+
+        # Quantize straight into a pooled scratch buffer behind the header,
+        # so the only copy made is the bytes handed back
+        scratch = _borrow_wav_buffer(total)
+        try:
+            scratch[:_WAV_HEADER.size] = _wav_header(data_size, sample_rate)
+            pcm = np.frombuffer(scratch, dtype=np.int16, count=n, offset=_WAV_HEADER.size)
+            self._quantize(audio_array, pcm)
+            return bytes(memoryview(scratch)[:total])
+        finally:
+            _return_wav_buffer(scratch)
+
+    def _array_to_pcm(self, audio_array) -> bytes:
+        """Convert numpy array to raw 16-bit PCM bytes (no header)."""
+        audio_array = np.ravel(audio_array)
+        audio_int16 = np.empty(audio_array.size, dtype=np.int16)
+        self._quantize(audio_array, audio_int16)
+        return audio_int16.tobytes()
+
+    def _quantize(self, audio_array, out):
+        """Scale float samples in [-1, 1] into the int16 array out, saturating at the limits."""
+        n = audio_array.size
+        scratch = float32_pool.acquire(n)
+        try:
+            # Scale, round and clip in place in pooled scratch so
+            # out-of-range samples clip instead of wrapping around
+            scaled = scratch[:n]
+            np.multiply(audio_array, 32767.0, out=scaled)
+            np.rint(scaled, out=scaled)
+            np.clip(scaled, -32768, 32767, out=scaled)
+            np.copyto(out, scaled, casting="unsafe")
+        finally:
+            float32_pool.release(scratch)
 
     @property
     def is_initialized(self) -> bool:
         return self._initialized
 
+    @property
+    def is_warming_up(self) -> bool:
+        return self._warming_up
+
     @property
     def has_voice_clone(self) -> bool:
         return self.voice_prompt is not None
@@ -216,12 +743,49 @@ tts_engine = TTSEngine()
 # API ROUTES
 # ============================================================================
 
+def _warming_up_response():
+    """503 returned by synthesis routes while the model is still loading."""
+    response = jsonify({"error": "TTS engine is warming up"})
+    response.headers["Retry-After"] = "5"
+    return response, 503
+
+
+def _clamp_rate(data: dict) -> float:
+    """Speech rate from a request body, clamped to the valid 0.5-2.0 range."""
+    return max(0.5, min(2.0, data.get("rate", 1.0)))
+
+
+def _parse_text_request():
+    """Read text and rate from a synthesis request as (text, rate, error_response)."""
+    data = request.get_json()
+
+    if not data or "text" not in data:
+        return None, None, (jsonify({"error": "Missing 'text' field"}), 400)
+
+    return data["text"], _clamp_rate(data), None
+
+
+def _cached_file_response(text: str, rate: float):
+    """Serve already generated audio straight from disk (sendfile where available), or None."""
+    cache_path = tts_engine.get_cached_file(text, rate)
+    if cache_path is None or not cache_path.exists():
+        return None
+
+    return send_file(
+        cache_path,
+        mimetype="audio/wav",
+        download_name="speech.wav",
+        max_age=3600
+    )
+
+
 @app.route("/health", methods=["GET"])
 def health_check():
     """Health check endpoint for the game to detect server availability."""
     return jsonify({
         "status": "ok",
         "initialized": tts_engine.is_initialized,
+        "warming_up": tts_engine.is_warming_up,
         "voice_clone_active": tts_engine.has_voice_clone if tts_engine.is_initialized else False,
         "model": config.model_name
     })
@@ -240,17 +804,18 @@ def synthesize():
     Returns:
         Audio file (WAV format)
     """
-    try:
-        data = request.get_json()
-
-        if not data or "text" not in data:
-            return jsonify({"error": "Missing 'text' field"}), 400
+    if tts_engine.is_warming_up:
+        return _warming_up_response()
 
-        text = data["text"]
-        rate = data.get("rate", 1.0)
+    try:
+        text, rate, error = _parse_text_request()
+        if error:
+            return error
 
-        # Clamp rate to valid range
-        rate = max(0.5, min(2.0, rate))
+        # Serve previously generated audio straight from disk
+        cached = _cached_file_response(text, rate)
+        if cached is not None:
+            return cached
 
         # Synthesize
         audio_data = tts_engine.synthesize(text, rate)
@@ -270,6 +835,108 @@ def synthesize():
         return jsonify({"error": str(e)}), 500
 
 
+@app.route("/synthesize_stream", methods=["POST"])
+def synthesize_stream():
+    """
+    Synthesize speech from text, streaming the WAV as it is generated.
+
+    Request JSON:
+        - text: string (required) - Text to synthesize
+        - rate: float (optional) - Speech rate (0.5-2.0, default 1.0)
+
+    Returns:
+        Chunked audio stream (WAV format). The header carries a placeholder
+        length, so players should read until the connection closes.
+    """
+    if tts_engine.is_warming_up:
+        return _warming_up_response()
+
+    try:
+        text, rate, error = _parse_text_request()
+        if error:
+            return error
+
+        # Already generated audio needs no streaming
+        cached = _cached_file_response(text, rate)
+        if cached is not None:
+            return cached
+
+        # Load the model and produce the first chunk before committing to a
+        # 200 response, so early failures still come back as a JSON error
+        tts_engine.initialize()
+        stream = tts_engine.synthesize_stream(text, rate)
+        first_chunk = next(stream)
+
+        return Response(
+            stream_with_context(itertools.chain([first_chunk], stream)),
+            mimetype="audio/wav",
+            headers={
+                "Content-Disposition": "inline; filename=speech.wav",
+                "Cache-Control": "no-store"
+            }
+        )
+
+    except Exception as e:
+        logger.error(f"Streaming synthesis error: {e}")
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route("/synthesize_batch", methods=["POST"])
+def synthesize_batch():
+    """
+    Synthesize several lines of speech in a single request.
+
+    Request JSON:
+        - lines: list of strings (required) - Texts to synthesize, in order
+        - rate: float (optional) - Speech rate (0.5-2.0, default 1.0)
+
+    Returns:
+        multipart/form-data with one WAV part per line, named line-0, line-1, ...
+    """
+    if tts_engine.is_warming_up:
+        return _warming_up_response()
+
+    try:
+        data = request.get_json()
+
+        if not data or "lines" not in data:
+            return jsonify({"error": "Missing 'lines' field"}), 400
+
+        lines = data["lines"]
+        if not isinstance(lines, list) or not all(isinstance(line, str) for line in lines):
+            return jsonify({"error": "'lines' must be a list of strings"}), 400
+        if len(lines) > config.max_batch_lines:
+            return jsonify({"error": f"At most {config.max_batch_lines} lines per batch"}), 400
+
+        rate = _clamp_rate(data)
+
+        # Synthesize
+        audio_parts = tts_engine.synthesize_batch(lines, rate)
+
+        # Return as multipart body, readable with fetch().formData() in the browser
+        boundary = uuid.uuid4().hex
+        chunks = []
+        for i, audio_data in enumerate(audio_parts):
+            chunks.append(
+                f"--{boundary}\r\n"
+                f"Content-Disposition: form-data; name=\"line-{i}\"; filename=\"line-{i}.wav\"\r\n"
+                f"Content-Type: audio/wav\r\n\r\n".encode()
+            )
+            chunks.append(audio_data)
+            chunks.append(b"\r\n")
+        chunks.append(f"--{boundary}--\r\n".encode())
+
+        return Response(
+            b"".join(chunks),
+            mimetype=f"multipart/form-data; boundary={boundary}",
+            headers={"Cache-Control": "no-store"}
+        )
+
+    except Exception as e:
+        logger.error(f"Batch synthesis error: {e}")
+        return jsonify({"error": str(e)}), 500
+
+
 @app.route("/voices", methods=["GET"])
 def list_voices():
     """List available voices."""
@@ -315,8 +982,8 @@ def upload_reference():
     # Update config
     config.reference_text = text
 
-    # Reload voice prompt
-    tts_engine._load_voice_prompt()
+    # Reload voice prompt and drop audio made with the old voice
+    tts_engine.reload_reference()
 
     return jsonify({
         "status": "ok",
@@ -351,7 +1018,7 @@ def main():
 ╠══════════════════════════════════════════════════════════════════╣
 ║  This server provides voice synthesis for Game Master narration  ║
 ║                                                                  ║
-║  The TTS model will be downloaded on first use (~2-4 GB)         ║
+║  The TTS model is downloaded on first start (~2-4 GB)            ║
 ║  Voice cloning requires a 3-second reference audio file          ║
 ╚══════════════════════════════════════════════════════════════════╝
 """)
@@ -368,15 +1035,22 @@ def main():
         logger.warning(f"  To enable voice cloning, add a 3-second WAV file to:")
         logger.warning(f"  {config.reference_audio}")
 
+    # Load the model in the background; synthesis answers 503 until it is ready
+    tts_engine.start_warmup()
+
     print("\nServer ready! The game will connect automatically.")
     print("Press Ctrl+C to stop.\n")
 
-    app.run(
-        host=config.host,
-        port=config.port,
-        debug=False,
-        threaded=True
-    )
+    try:
+        app.run(
+            host=config.host,
+            port=config.port,
+            debug=False,
+            threaded=True
+        )
+    finally:
+        # Flush queued cache writes so no generated audio is lost
+        tts_engine.shutdown()
 
 
 if __name__ == "__main__":